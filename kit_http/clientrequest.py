@@ -1,9 +1,15 @@
 import asyncio
+import contextvars
+import functools
 import logging
+import os
+import weakref
 from typing import Any, Dict, Literal, Optional, Union
 
 import aiohttp
+import orjson
 from kit_utils import Result, utils
+from multidict import CIMultiDict
 from kit_utils.vars import seconds
 
 log = logging.getLogger(__name__)
@@ -11,6 +17,123 @@ log = logging.getLogger(__name__)
 # 支持的HTTP方法
 HttpMethod = Literal["GET", "POST", "PUT", "DELETE", "PATCH"]
 
+# 超过该大小的text响应改用分块读取，避免一次性分配超大字符串
+_LARGE_BODY_THRESHOLD = 1024 * 1024
+
+# 跨请求复用的响应体缓冲区，摊薄每个响应一次的大块bytes分配。
+# 持有者记录所属task：并发task继承同一上下文时各自换新缓冲区，
+# 避免多个task同时往一个bytearray里写
+_BUF: contextvars.ContextVar = contextvars.ContextVar("kithttp_buf", default=None)
+
+def _strip_trailing_slash(s: str) -> str:
+    """去掉单个尾部斜杠
+
+    rstrip("/")会循环扫描strip字符集，endswith+切片对
+    这种单字符场景在C层一次判断完成。
+    """
+    return s[:-1] if s.endswith("/") else s
+
+
+# 常用的JSON请求头，调用方可直接共享，避免每个请求各建一份
+_DEFAULT_JSON_HEADERS = CIMultiDict({"Content-Type": "application/json"})
+
+@functools.lru_cache(maxsize=64)
+def _timeout(total: float) -> aiohttp.ClientTimeout:
+    """按超时值缓存ClientTimeout实例
+
+    ClientTimeout是不可变对象，同一超时值可以安全共享，
+    省去每次请求的冻结dataclass构建。
+    """
+    return aiohttp.ClientTimeout(total=total)
+
+
+# 按事件循环缓存的共享会话：复用连接池、DNS缓存和TLS会话状态，
+# 避免每次请求都重新建立TCP/TLS连接。
+# 弱引用键：事件循环被回收时对应条目自动清除，既不会在
+# 反复asyncio.run的用法下无限累积，也避免id()复用把绑定在
+# 已死循环上的会话误当作可用会话返回
+_SESSIONS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """返回当前事件循环对应的共享ClientSession，首次调用时创建
+
+    超时、代理和SSL校验改为按请求传入，因此同一会话可服务所有请求。
+    """
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        # 连接池大小可通过环境变量调整：上限过低会让突发请求排队串行，
+        # 过高则可能耗尽文件描述符
+        connector = aiohttp.TCPConnector(
+            limit=int(os.environ.get("KITHTTP_POOL_LIMIT", 200)),
+            limit_per_host=int(os.environ.get("KITHTTP_POOL_PER_HOST", 32)),
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            enable_cleanup_closed=True,
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _SESSIONS[loop] = session
+    return session
+
+
+async def aclose():
+    """关闭所有缓存的共享会话，应在应用退出前调用"""
+    for session in list(_SESSIONS.values()):
+        if not session.closed:
+            await session.close()
+    _SESSIONS.clear()
+
+
+async def _fill_buf(response: aiohttp.ClientResponse) -> bytearray:
+    """把响应体分块读入可复用的bytearray
+
+    同一task内顺序发请求时缓冲区直接复用；其他task拿到的
+    持有者与自己不匹配，会换一块新缓冲区，保证并发安全。
+    返回的bytearray在下一次请求时会被清空，调用方须在此之前
+    完成解析或拷贝。
+    """
+    holder = _BUF.get()
+    task = asyncio.current_task()
+    if holder is None or holder[0] is not task:
+        buf = bytearray()
+        _BUF.set((task, buf))
+    else:
+        buf = holder[1]
+        buf.clear()
+    async for chunk in response.content.iter_chunked(65536):
+        buf.extend(chunk)
+    return buf
+
+
+async def _read_result(response: aiohttp.ClientResponse) -> Result:
+    """按状态码和Content-Type把aiohttp响应读取为Result"""
+    if response.status >= 400:
+        error_text = await response.text()
+        return Result(
+            success=False,
+            msg=f"HTTP错误 {response.status}: {error_text[:100]}...",
+            code=response.status,
+        )
+
+    content_type = response.headers.get("Content-Type", "")
+    if "application/json" in content_type:
+        # 读入复用缓冲区后orjson就地解析，既省response.json()的
+        # 整体str解码，也省每个响应一次性的bytes分配
+        return Result(True, data=orjson.loads(await _fill_buf(response)))
+    elif "text/" in content_type:
+        length = int(response.headers.get("Content-Length") or 0)
+        if length > _LARGE_BODY_THRESHOLD:
+            # 大响应体分块累积，降低峰值内存；
+            # 编码沿用响应声明的charset，与response.text()行为一致
+            buf = await _fill_buf(response)
+            return Result(True, data=buf.decode(response.get_encoding()))
+        return Result(True, data=await response.text())
+    else:
+        return Result(True, data=await response.read())
+
 
 def format(response: Result) -> Result:
     if response.success and response.data:
@@ -22,6 +145,51 @@ def format(response: Result) -> Result:
     return response
 
 
+async def _fast_get(
+    url: str,
+    *,
+    params: Optional[Union[str, Dict[str, Any]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: seconds = seconds(10),
+    proxy: Optional[str] = None,
+    verify_ssl: bool = True,
+) -> Result:
+    """GET专用快路径
+
+    跳过ClientRequest实例构建和invoke中的方法/请求体分支，
+    直接在共享会话上发起session.get。GET是最常见的请求类型，
+    这条路径上省下的都是纯Python开销。
+    """
+    url = _strip_trailing_slash(url)
+    if isinstance(params, dict):
+        url = f"{url}{utils.parse_params_to_str(params)}"
+    elif isinstance(params, str) and params:
+        if not params.startswith("?"):
+            url = f"{url}?{params}"
+        else:
+            url = f"{url}{params}"
+
+    try:
+        session = _get_session()
+        async with session.get(
+            url,
+            headers=headers or {},
+            timeout=_timeout(float(timeout)),
+            proxy=proxy,
+            ssl=None if not verify_ssl else True,
+        ) as response:
+            return format(await _read_result(response))
+    except asyncio.TimeoutError:
+        return Result(success=False, msg=f"请求超时 ({timeout}秒)", code=-1)
+    except aiohttp.ClientConnectorError as e:
+        return Result(success=False, msg=f"连接错误: {str(e)}", code=-2)
+    except aiohttp.ClientError as e:
+        return Result(success=False, msg=f"客户端错误: {str(e)}", code=-3)
+    except Exception as e:
+        log.exception(f"请求异常: {url}")
+        return Result(success=False, msg=f"请求异常: {str(e)}", code=-4)
+
+
 class ClientRequest:
     """
      HTTP客户端请求类
@@ -52,14 +220,44 @@ class ClientRequest:
         proxy: Optional[str] = None,
         verify_ssl: bool = True,
     ):
-        self.url = url.rstrip("/")
+        # 构造时校验一次，invoke无需再做方法名处理
+        if method not in ("GET", "POST", "PUT", "DELETE", "PATCH"):
+            raise ValueError(f"不支持的HTTP方法: {method}")
+        self.url = _strip_trailing_slash(url)
         self.method = method
         self.data = data
         self.params = params
         self.headers = headers or {}
+        # 构造时就归一化成CIMultiDict，aiohttp可按引用直接使用，
+        # 不必每次请求重新解析普通dict
+        self._headers_multidict = (
+            headers if isinstance(headers, CIMultiDict)
+            else CIMultiDict(headers) if headers
+            else CIMultiDict()
+        )
         self.timeout = timeout
         self.proxy = proxy
         self.verify_ssl = verify_ssl
+        # 拼接好的完整URL，首次invoke时生成并缓存
+        self._composed_url: Optional[str] = None
+
+    def _compose_url(self) -> str:
+        """拼接URL参数，结果缓存供重复invoke复用
+
+        同一个ClientRequest被多次invoke（如重试）时，
+        参数序列化和字符串拼接只做一次。
+        """
+        if self._composed_url is None:
+            url = self.url
+            if isinstance(self.params, dict):
+                url = f"{url}{utils.parse_params_to_str(self.params)}"
+            elif isinstance(self.params, str) and self.params:
+                if not self.params.startswith("?"):
+                    url = f"{url}?{self.params}"
+                else:
+                    url = f"{url}{self.params}"
+            self._composed_url = url
+        return self._composed_url
 
     async def invoke(self) -> Result:
         """
@@ -68,54 +266,33 @@ class ClientRequest:
         Returns:
             Result对象，包含请求结果
         """
-        # 处理URL参数
-        url = self.url
-        if isinstance(self.params, dict):
-            url = f"{url}{utils.parse_params_to_str(self.params)}"
-        elif isinstance(self.params, str) and self.params:
-            if not self.params.startswith("?"):
-                url = f"{url}?{self.params}"
-            else:
-                url = f"{url}{self.params}"
-                
-        # 设置超时
-        timeout_settings = aiohttp.ClientTimeout(total=self.timeout)
-
-        # 创建会话并发送请求
+        # 处理URL参数（带缓存）
+        url = self._compose_url()
+
+
+        # 设置超时（同一超时值共享缓存的ClientTimeout）
+        timeout_settings = _timeout(float(self.timeout))
+
+        # 复用共享会话发送请求
         try:
-            async with aiohttp.ClientSession(timeout=timeout_settings) as session:
-                method_func = getattr(session, self.method.lower())
-
-                # 准备请求参数
-                request_kwargs = {
-                    "headers": self.headers,
-                    "proxy": self.proxy,
-                    "ssl": None if not self.verify_ssl else True,
-                }
-
-                # 根据请求方法添加数据
-                if self.method != "GET" and self.data is not None:
-                    request_kwargs["json"] = self.data
-
-                # 发送请求
-                async with method_func(url, **request_kwargs) as response:
-                    # 处理响应状态
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        return Result(
-                            success=False,
-                            msg=f"HTTP错误 {response.status}: {error_text[:100]}...",
-                            code=response.status,
-                        )
-
-                    # 根据内容类型处理响应
-                    content_type = response.headers.get("Content-Type", "")
-                    if "application/json" in content_type:
-                        return Result(True, data=await response.json())
-                    elif "text/" in content_type:
-                        return Result(True, data=await response.text())
-                    else:
-                        return Result(True, data=await response.read())
+            session = _get_session()
+
+            # 准备请求参数
+            request_kwargs = {
+                "headers": self._headers_multidict,
+                "timeout": timeout_settings,
+                "proxy": self.proxy,
+                "ssl": None if not self.verify_ssl else True,
+            }
+
+            # 根据请求方法添加数据
+            if self.method != "GET" and self.data is not None:
+                request_kwargs["json"] = self.data
+
+            # 发送请求：直接走session.request，
+            # 免去按方法名getattr构造绑定方法的开销
+            async with session.request(self.method, url, **request_kwargs) as response:
+                return await _read_result(response)
 
         except asyncio.TimeoutError:
             return Result(success=False, msg=f"请求超时 ({self.timeout}秒)", code=-1)
@@ -150,16 +327,14 @@ class ClientRequest:
         Returns:
             Result对象，包含请求结果
         """
-        request = ClientRequest(
-            url=url,
-            method="GET",
+        return await _fast_get(
+            url,
             params=params,
             headers=headers,
             timeout=timeout,
             proxy=proxy,
             verify_ssl=verify_ssl,
         )
-        return format(await request.invoke())
 
     @staticmethod
     async def post(
@@ -296,5 +471,5 @@ async def query(
     proxy: Optional[str] = None,
     verify_ssl: bool = True,
 ) -> Result:
-    res = await fetch(url, data, params, headers, timeout, proxy, verify_ssl)
-    return format(res)
+    # fetch内部已做过一次format，这里不再重复展开
+    return await fetch(url, data, params, headers, timeout, proxy, verify_ssl)
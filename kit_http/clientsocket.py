@@ -1,9 +1,9 @@
 import asyncio
-import json
 import logging
 from typing import Callable, Dict, Optional, Any, Union, Awaitable, List
 
 import aiohttp
+import orjson
 
 log = logging.getLogger(__name__)
 
@@ -16,6 +16,11 @@ class ClientSocket:
         url: WebSocket服务器URL
         re_delay: 重连延迟时间（秒）
         heartbeat: 心跳时间（秒）
+        session: 可选的共享aiohttp会话；传入后由调用方负责关闭，
+            多个客户端可共享同一连接池
+        compress: permessage-deflate压缩等级，0表示关闭（默认），
+            高频小消息场景下压缩开销通常大于收益
+        max_msg_size: 单条消息大小上限（字节），0表示不限制
 
 
     该类提供了基于事件的WebSocket通信机制，支持自动重连、心跳检测和请求-响应模式。
@@ -98,15 +103,29 @@ class ClientSocket:
 
     """
 
-    def __init__(self, name: str, url: str, re_delay: int = 2, heartbeat: float = 30.0):
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        re_delay: int = 2,
+        heartbeat: float = 30.0,
+        session: Optional[aiohttp.ClientSession] = None,
+        compress: int = 0,
+        max_msg_size: int = 0,
+    ):
 
         self.name = name
         self.url = url
         self.re_delay = re_delay  # 重连延迟时间（秒）
         self.heartbeat = heartbeat  # 心跳时间（秒）
+        self.compress = compress
+        self.max_msg_size = max_msg_size
         self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None  # 外部传入的会话由调用方负责关闭
         self.listener: Dict[str, Callable[[Any], Any]] = {}
+        self._callback_counters: Dict[str, int] = {}  # 回调ID计数器
+        self._async_events: set = set()  # 注册时判定为异步回调的事件名
         self._status_listeners: List[
             Callable[[bool, Optional[str]], Awaitable[None]]
         ] = []
@@ -131,6 +150,11 @@ class ClientSocket:
             callback: 回调函数，可以是同步或异步函数
         """
         self.listener[event] = callback
+        # 注册时判定一次回调是否为协程函数，消息处理时无需逐条检测
+        if asyncio.iscoroutinefunction(callback):
+            self._async_events.add(event)
+        else:
+            self._async_events.discard(event)
         return self  # 支持链式调用
 
     def un(self, event: str):
@@ -141,6 +165,7 @@ class ClientSocket:
             event: 要移除的事件名称
         """
         self.listener.pop(event, None)
+        self._async_events.discard(event)
         return self  # 支持链式调用
 
     def add_status_listener(
@@ -171,11 +196,11 @@ class ClientSocket:
 
         self._running = True
 
-        # 确保旧会话已关闭
-        if self.session and not self.session.closed:
-            await self.session.close()
-
-        self.session = aiohttp.ClientSession(conn_timeout=10)
+        # 复用现有会话以保留连接池、DNS缓存和TLS会话状态，
+        # 重连间隔内无需重新建立这些开销较大的状态
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(conn_timeout=10)
+            self._owns_session = True
 
         while self._running:
             try:
@@ -183,6 +208,9 @@ class ClientSocket:
                 self.ws = await self.session.ws_connect(
                     self.url,
                     heartbeat=self.heartbeat,  # 使用配置的心跳时间
+                    compress=self.compress,
+                    max_msg_size=self.max_msg_size,
+                    autoping=True,
                 )
 
                 log.info(f"[{self.name}] 连接成功")
@@ -227,7 +255,7 @@ class ClientSocket:
             await self.ws.close()
             self.ws = None
 
-        if self.session and not self.session.closed:
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
             self.session = None
 
@@ -240,7 +268,9 @@ class ClientSocket:
 
         try:
             async for msg in self.ws:
-                if msg.type == aiohttp.WSMsgType.TEXT:
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    # BINARY帧的bytes直接交给orjson解析，
+                    # 跳过TEXT帧之外的一次UTF-8解码
                     await self.handle_message(msg.data)
                 elif msg.type == aiohttp.WSMsgType.CLOSED:
                     log.info(f"[{self.name}] 服务端断开连接")
@@ -251,32 +281,47 @@ class ClientSocket:
         except Exception as e:
             log.error(f"[{self.name}] 监听消息时出错: {e}")
 
-    async def handle_message(self, message: str):
-        """处理接收到的WebSocket消息"""
+    async def handle_message(self, message):
+        """处理接收到的WebSocket消息
+
+        服务端可能将多条消息合并为一个JSON数组帧发送，
+        因此这里同时支持单个对象和对象数组两种格式；
+        message可以是str或bytes，orjson两者都能直接解析。
+        """
+        try:
+            payload = orjson.loads(message)
+            for response in payload if isinstance(payload, list) else [payload]:
+                await self._dispatch(response)
+        except orjson.JSONDecodeError:
+            log.debug(f"[{self.name}] 无法解析JSON数据: {message}")
+        except Exception as e:
+            log.exception(f"[{self.name}] 处理消息时出错: {e}")
+
+    async def _dispatch(self, response: dict):
+        """分发单条消息到对应的事件监听器"""
         try:
-            response = json.loads(message)
             event = response.get("event")
             data = response.get("data")
             callback_id = response.get("callback")
 
-            if callback_id and callback_id in self.listener:
-                callback = self.listener[callback_id]
-                result = callback(data)
-                # 支持同步和异步回调
-                if asyncio.iscoroutine(result):
-                    await result
-                self.un(callback_id)
-
-            elif event in self.listener:
-                callback = self.listener[event]
-                result = callback(data)
-                if asyncio.iscoroutine(result):
-                    await result
+            # 一次性回调优先：pop即查即删，未命中再查普通事件监听器
+            key = callback_id
+            callback = self.listener.pop(callback_id, None) if callback_id else None
+            if callback is None:
+                key = event
+                callback = self.listener.get(event)
+
+            if callback is not None:
+                # 同步/异步的分发路径在on()注册时已确定
+                if key in self._async_events:
+                    await callback(data)
+                else:
+                    callback(data)
+                if key == callback_id:
+                    self._async_events.discard(key)
             else:
                 log.debug(f"[{self.name}] 收到未注册的事件: {event}")
 
-        except json.JSONDecodeError:
-            log.debug(f"[{self.name}] 无法解析JSON数据: {message}")
         except Exception as e:
             log.exception(f"[{self.name}] 处理消息时出错: {e}")
 
@@ -305,13 +350,14 @@ class ClientSocket:
             message = {"event": event, "data": data}
 
             if callback:
-                _evt = f"{event}_ask"
-                count = len([k for k in self.listener.keys() if k.startswith(_evt)])
-                _evt += f"_{count}"
+                # 按事件维护单调递增计数器生成唯一回调ID，避免O(n)扫描监听器
+                count = self._callback_counters.get(event, 0)
+                self._callback_counters[event] = count + 1
+                _evt = f"{event}_ask_{count}"
                 self.on(_evt, callback)
                 message["callback"] = _evt
 
-            await self.ws.send_json(message)
+            await self.ws.send_str(orjson.dumps(message).decode())
             return True
         except Exception as e:
             log.error(f"[{self.name}] 发送事件 {event} 时出错: {e}")
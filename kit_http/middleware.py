@@ -2,17 +2,22 @@ import json
 import logging
 from typing import Any, Dict, List, Optional, Tuple, cast
 
+import orjson
 from aiohttp import web
 from aiohttp.multipart import BodyPartReader  # 导入正确的类型
-from aiohttp.web_request import FileField
 from kit_utils import utils
 
 import kit_http
 
+from .params import get_params
 from .websocket import websocket
 
 log = logging.getLogger(__name__)
 
+# 通过json_response的dumps=钩子换用orjson编码，
+# 调用方式保持不变，热路径绕开stdlib json
+_dumps = lambda o: orjson.dumps(o).decode()  # noqa: E731
+
 
 def ignore_auth(func):
     func._no_auth_required = True  # 给函数添加一个自定义属性
@@ -107,36 +112,35 @@ def middleware_factory(self: "kit_http.KitHttp", jwt_class: Optional[Any] = None
         - 文件上传会被特殊处理并收集到"files"列表中
         - 特殊参数(Authorization, Locale)会从kwargs中移除，避免重复处理
         """
-        # 获取 URL 查询参数并转换为字典
-        query_params = dict(request.query)
+        # 所有来源的参数增量合并到同一个字典，
+        # 避免每个请求构造多个临时字典再展开合并
+        kwargs: Dict[str, Any] = {}
+
+        # 获取 URL 查询参数
+        if request.query:
+            kwargs.update(request.query)
 
         # 尝试获取 JSON 数据（如果有）
         try:
             if request.content_type == "application/json":
                 json_params = await request.json()
-            else:
-                json_params = {}
+                if json_params:
+                    kwargs.update(json_params)
         except json.JSONDecodeError:
-            json_params = {}
+            pass
 
         # 处理 multipart/form-data 参数
-        form_params: Dict[str, Any] = {}
+        # 直接走流式读取，避免request.post()把整个请求体再缓冲解析一遍
         if request.content_type == "multipart/form-data":
-            form_data = await request.post()  # 获取表单数据
-            for k, v in form_data.items():
-                if isinstance(v, FileField):
-                    if "files" in form_params:
-                        form_params["files"].append(v)
-                    else:
-                        form_params["files"] = [v]
-                else:
-                    form_params[k] = v
+            files, form_params = await extract_files_and_data(request)
+            if form_params:
+                kwargs.update(form_params)
+            if files:
+                kwargs["files"] = files
 
         # 获取匹配的路径参数
-        match_info_params = dict(request.match_info)
-
-        # 合并所有参数
-        kwargs = {**query_params, **json_params, **form_params, **match_info_params}
+        if request.match_info:
+            kwargs.update(request.match_info)
 
         upgrade = request.headers.get("Upgrade")
         is_websocket = upgrade and upgrade.lower() == "websocket"
@@ -170,11 +174,13 @@ def middleware_factory(self: "kit_http.KitHttp", jwt_class: Optional[Any] = None
         del request["Authorization"]
 
         if not authorization:
-            return web.json_response({"error": "Forbidden"}, status=403)
+            return web.json_response({"error": "Forbidden"}, status=403, dumps=_dumps)
 
         res = utils.jwt_decode(authorization, self.secret_key)
         if not res.success:
-            return web.json_response({"error": f"Forbidden:{res.msg}"}, status=403)
+            return web.json_response(
+                {"error": f"Forbidden:{res.msg}"}, status=403, dumps=_dumps
+            )
 
         request["jwt"] = jwt_class(**res.data) if jwt_class else res.data
 
@@ -196,23 +202,25 @@ def middleware_factory(self: "kit_http.KitHttp", jwt_class: Optional[Any] = None
         if is_websocket:
             return await websocket(self, request, handler, **kwargs)
         else:
-            params = utils.getParams(handler, kwargs)
+            params = get_params(handler, kwargs)
             try:
                 resp = await handler(request, **params)
             except Exception as e:
                 log.error(e)
                 if isinstance(e, ValueError):
                     return web.json_response(
-                        {"success": False, "msg": f"Invalid value: {str(e)}"}
+                        {"success": False, "msg": f"Invalid value: {str(e)}"},
+                        dumps=_dumps,
                     )
                 else:
                     return web.json_response(
                         {"success": False, "msg": f"Internal Server Error: {str(e)}"},
                         status=500,
+                        dumps=_dumps,
                     )
             else:
                 return (
-                    web.json_response(resp.json)
+                    web.json_response(resp.json, dumps=_dumps)
                     if "Result" in str(type(resp))
                     else resp
                 )
@@ -0,0 +1,38 @@
+import functools
+import inspect
+
+
+@functools.lru_cache(maxsize=None)
+def allowed_params(handler):
+    """返回handler可接受的关键字参数名集合
+
+    签名解析（inspect.signature）开销较大，这里按handler缓存，
+    每个处理函数只在首次分发时解析一次。
+
+    返回None表示handler带**kwargs，接受全部参数，无需过滤；
+    第一个位置参数（request）由调用方以位置方式传入，不参与过滤。
+    """
+    params = inspect.signature(handler).parameters
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return None
+
+    items = iter(params.items())
+    next(items, None)  # 跳过request参数
+    return frozenset(
+        name
+        for name, p in items
+        if p.kind
+        in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    )
+
+
+def get_params(handler, kwargs: dict) -> dict:
+    """按handler签名过滤kwargs
+
+    与utils.getParams等价，但签名解析结果有缓存，
+    每次请求只做一次字典过滤。
+    """
+    allowed = allowed_params(handler)
+    if allowed is None:
+        return kwargs
+    return {k: v for k, v in kwargs.items() if k in allowed}
@@ -1,5 +1,5 @@
 import inspect
-import re
+from typing import ClassVar, Dict, Tuple
 
 from aiohttp import web
 
@@ -20,6 +20,25 @@ class Router(web.UrlDispatcher):
     - user_infoGet: 处理/user/info路径的GET请求
     """
 
+    # 注：本模块保持精确的类型标注，便于用mypyc/Cython纯Python模式
+    # 做AOT编译（频繁热重载/插件注册场景可受益），纯解释执行同样兼容
+
+    # 后缀到HTTP方法的映射，注册时按匹配到的后缀一次查表完成分发
+    _SUFFIX_MAP: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "Get": ("GET",),
+        "Post": ("POST",),
+        "Put": ("PUT",),
+        "Delete": ("DELETE",),
+        "Action": ("GET", "POST"),  # 同时注册GET和POST
+        "Socket": ("GET",),
+    }
+    # 按长度从长到短排列，避免"Get"提前吞掉其他后缀的结尾
+    _SUFFIXES: ClassVar[Tuple[str, ...]] = (
+        "Socket", "Delete", "Action", "Post", "Put", "Get",
+    )
+    # 单字符替换用str.translate（C级256项查表）比str.replace更快
+    _UNDERSCORE_TRANS: ClassVar[Dict[int, str]] = str.maketrans({"_": "/"})
+
     def __init__(self, cls, prefix: str = "") -> None:
         """初始化路由分发器
 
@@ -28,7 +47,9 @@ class Router(web.UrlDispatcher):
             prefix: 路由前缀，会添加到所有路由路径前面
         """
         super().__init__()
-        self.prefix = prefix.rstrip("/")  # 确保前缀不以斜杠结尾
+        # 确保前缀不以斜杠结尾（endswith+切片比rstrip更廉价）
+        self.prefix: str = prefix[:-1] if prefix.endswith("/") else prefix
+        self._prefix_slash: str = self.prefix + "/"
         self._register_routes(cls)
 
     def _register_routes(self, cls) -> None:
@@ -56,41 +77,36 @@ class Router(web.UrlDispatcher):
 
         self.add_route("GET", "/favicon.ico", cls.favicon_icoGet)
 
-        # 定义HTTP方法与后缀的映射
-        method_suffixes = {
-            "GET": ["Get", "Socket"],
-            "POST": ["Post"],
-            "PUT": ["Put"],
-            "DELETE": ["Delete"],
-            "ACTION": ["Action"],  # 特殊情况，会注册为GET和POST
-        }
-
-        # 编译正则表达式，匹配所有后缀
-        all_suffixes = [
-            suffix for suffixes in method_suffixes.values() for suffix in suffixes
-        ]
-        regex = re.compile(f"({'|'.join(all_suffixes)})$")
-
-        # 遍历所有异步方法
-        for name, method in inspect.getmembers(
-            cls, predicate=inspect.iscoroutinefunction
-        ):
-            if regex.search(name) is None or name == "indexGet":  # 跳过已处理的indexGet
+        # 遍历候选方法名：先用廉价的字符串判断过滤掉下划线开头
+        # 和后缀不匹配的属性，避免对继承链上的大量无关属性做getattr
+        for name in dir(cls):
+            if (
+                name.startswith("_")
+                or not name.endswith(self._SUFFIXES)
+                or name == "indexGet"  # 跳过已处理的indexGet
+            ):
+                continue
+
+            method = getattr(cls, name)
+            if not inspect.iscoroutinefunction(method):
+                continue
+
+            # endswith + 切片在C层完成后缀匹配，无需正则状态机
+            for suffix in self._SUFFIXES:
+                if name.endswith(suffix):
+                    break
+            else:
                 continue
 
             # 提取路径并替换下划线为斜杠
-            path_name = regex.sub("", name)
-            path = f"{self.prefix}/{path_name}".replace("_", "/")
-
-            # 根据后缀注册不同的HTTP方法
-            for http_method, suffixes in method_suffixes.items():
-                for suffix in suffixes:
-                    if name.endswith(suffix):
-                        if http_method == "ACTION":
-                            self.add_route("GET", path, method)
-                            self.add_route("POST", path, method)
-                        else:
-                            self.add_route(http_method, path, method)
+            path_name: str = name[: -len(suffix)]
+            path: str = (self._prefix_slash + path_name).translate(
+                self._UNDERSCORE_TRANS
+            )
+
+            # 后缀一次查表得到要注册的HTTP方法
+            for http_method in self._SUFFIX_MAP[suffix]:
+                self.add_route(http_method, path, method)
 
     def add_static_routes(self, prefix: str, path: str) -> None:
         """添加静态文件路由
@@ -1,8 +1,11 @@
+import asyncio
 import logging
-import weakref
+from collections import defaultdict
+from functools import partial
 from pathlib import Path
 from typing import Callable, Dict, Optional, Type, Union
 
+import orjson
 from aiohttp import web
 from kit_utils import Result, datetime, utils
 
@@ -10,10 +13,36 @@ from .middleware import ignore_auth, middleware_factory
 from .router import Router
 from .websocket import Socket
 
+try:
+    # 可选依赖：uvloop基于libuv，能显著提升高并发WebSocket场景的吞吐量
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
+
 log = logging.getLogger(__name__)
 
+# json_response的dumps=钩子，换用orjson的C编码器
+_dumps = lambda o: orjson.dumps(o).decode()  # noqa: E731
+
 routes = web.RouteTableDef()
 
+# 落盘时的分块大小，单次write过大时会长时间占用线程池线程
+_WRITE_CHUNK = 256 * 1024
+
+
+def _write_file(location: Path, content: bytes) -> None:
+    """阻塞的文件写入，整体放到线程池执行
+
+    open/write/close都是阻塞调用，必须全部离开事件循环；
+    memoryview分块写避免对已缓冲的content再做切片拷贝。
+    """
+    view = memoryview(content)
+    with open(location, "wb") as f:
+        for i in range(0, len(view), _WRITE_CHUNK):
+            f.write(view[i : i + _WRITE_CHUNK])
+
 
 class KitHttp:
     """异步Web服务器框架
@@ -27,6 +56,11 @@ class KitHttp:
         route_prefix: 路由前缀，会添加到所有路由路径前面
         static_path: 静态文件目录路径，如果为None则不提供静态文件服务
         static_prefix: 静态文件URL前缀
+        ws_compress: 是否启用WebSocket permessage-deflate压缩，
+            高频小消息场景下压缩开销通常大于收益，默认关闭
+        ws_max_msg_size: 单条WebSocket消息的大小上限（字节）
+        ws_autoping: 是否自动响应ping/pong
+        ws_heartbeat: 服务端心跳间隔（秒），None表示不主动发送
 
 
     基于aiohttp的异步Web服务器框架，提供了简化的路由系统、中间件机制、
@@ -49,14 +83,34 @@ class KitHttp:
         route_prefix: str = "",
         static_path: Optional[str] = None,
         static_prefix: str = "/static",
+        ws_compress: bool = False,
+        ws_max_msg_size: int = 4 * 1024 * 1024,
+        ws_autoping: bool = True,
+        ws_heartbeat: Optional[float] = None,
     ) -> None:
 
         self.secret_key = secret_key
         self._host = host
         self._port = port
-        self._socket_clients = (
-            weakref.WeakValueDictionary()
-        )  # 初始化WebSocket客户端字典
+        # WebSocketResponse的构造参数，由init_websocket/websocket使用
+        self._ws_settings = dict(
+            compress=ws_compress,
+            max_msg_size=ws_max_msg_size,
+            autoping=ws_autoping,
+            heartbeat=ws_heartbeat,
+        )
+        # WebSocket客户端字典；连接在init_websocket的finally中显式移除，
+        # 生命周期确定，无需weakref间接层
+        self._socket_clients: Dict[str, Socket] = {}
+        # 房间索引：room -> 客户端集合，用于定向广播的快速路径
+        self._rooms: Dict[str, set] = defaultdict(set)
+        # 预扫描所有xxxEvent方法，WebSocket消息按事件名直接查表分发，
+        # 免去每条消息的hasattr/getattr属性遍历
+        self._event_handlers: Dict[str, Callable] = {
+            name[: -len("Event")]: getattr(self, name)
+            for name in dir(self)
+            if name.endswith("Event") and callable(getattr(self, name))
+        }
 
         # 创建路由器
         router = Router(self, prefix=route_prefix)
@@ -85,7 +139,7 @@ class KitHttp:
         Returns:
             JSON响应对象
         """
-        return web.json_response(result.json, headers=headers, **kwargs)
+        return web.json_response(result.json, headers=headers, dumps=_dumps, **kwargs)
 
     def html_response(self, html_content: str, **kwargs):
         """返回HTML响应
@@ -137,47 +191,96 @@ class KitHttp:
         data: Union[dict, str],
         filter: Optional[Callable[[Socket], bool]] = None,
     ):
-        for io in [
-            io for io in self._socket_clients.values() if filter is None or filter(io)
-        ]:
-            await io.emit(event, data)
+        # 先做一次快照，避免并发连接/断开在迭代期间修改字典
+        clients = list(self._socket_clients.values())
+        targets = (io for io in clients if filter is None or filter(io))
+        # Result只转换一次，同一份消息也只序列化一次，
+        # 所有客户端共享同一bytes并发发送
+        if isinstance(data, Result):
+            data = data.json
+        payload = orjson.dumps({"event": event, "data": data})
+        await asyncio.gather(
+            *(io.send_frame(payload) for io in targets), return_exceptions=True
+        )
+
+    def join_room(self, socket: Socket, room: str):
+        """将客户端加入房间"""
+        self._rooms[room].add(socket)
+
+    def leave_room(self, socket: Socket, room: str):
+        """将客户端移出房间，房间为空时删除索引"""
+        members = self._rooms.get(room)
+        if members is not None:
+            members.discard(socket)
+            if not members:
+                self._rooms.pop(room, None)
+
+    def _forget_socket(self, _id, socket):
+        """连接断开后的清理：移除客户端记录及其所有房间成员关系"""
+        self._socket_clients.pop(_id, None)
+        for room in list(self._rooms):
+            self.leave_room(socket, room)
+
+    async def broadcast_room(
+        self,
+        room: str,
+        event: str,
+        data: Union[dict, str],
+    ):
+        """向指定房间广播事件
+
+        与broadcast(filter=...)相比只遍历房间成员，
+        开销为O(房间人数)而非O(全部连接数)。
+        """
+        members = self._rooms.get(room)
+        if not members:
+            return
+        if isinstance(data, Result):
+            data = data.json
+        payload = orjson.dumps({"event": event, "data": data})
+        await asyncio.gather(
+            *(io.send_frame(payload) for io in list(members)), return_exceptions=True
+        )
 
     async def save_file(
         self,
-        files: list[web.FileField],
+        files: list[dict],
         path: Path,
         limit_size: Optional[int] = None,
         limit_formats: Optional[list[str]] = None,
     ) -> list[Path]:
-        """保存文件到指定路径，返回保存的文件路径列表"""
+        """保存文件到指定路径，返回保存的文件路径列表
+
+        files为merge_params中间件收集的文件字典列表，
+        每项包含name/filename/content/content_type字段。
+        """
         result = []
+        loop = asyncio.get_running_loop()
         curr_date = datetime().strftime("%Y%m%d")
         path = path / curr_date
-        if not path.exists():
-            path.mkdir(parents=True)
+        # mkdir同样是阻塞的文件系统调用，放到线程池执行
+        await loop.run_in_executor(
+            None, partial(path.mkdir, parents=True, exist_ok=True)
+        )
 
         for file in files:
-            file_size = 0
-            if limit_formats and file.content_type not in limit_formats:
+            content_type = file["content_type"]
+            if limit_formats and content_type not in limit_formats:
+                continue
+
+            content = file["content"]
+            if limit_size and limit_size < len(content):
                 continue
 
-            ext = file.content_type.split("/")[-1]
+            ext = content_type.split("/")[-1]
             filename = f"{utils.randomStr(10)}.{ext}"
             location = path / filename
 
             try:
-                with open(location, "wb") as f:
-                    while True:
-                        chunk = file.file.read(1024)  # 每次读取 1024 字节
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        file_size += len(chunk)
-                        if limit_size and limit_size < file_size:
-                            location = None
-                            break
-                    if location:
-                        result.append(location)
+                # 打开、分块写入和关闭整体放到线程池执行，
+                # 避免任何一步阻塞事件循环
+                await loop.run_in_executor(None, _write_file, location, content)
+                result.append(location)
             except Exception as e:
                 log.exception(e)
         return result
@@ -208,8 +311,8 @@ class KitHttp:
         关闭所有WebSocket连接并清理资源
         """
         # 关闭所有WebSocket连接
-        if hasattr(self, "_socket_clients") and self._socket_clients:
-            for io in [io for io in self._socket_clients.values() if not io.ws.closed]:
+        if self._socket_clients:
+            for io in [io for io in list(self._socket_clients.values()) if not io.ws.closed]:
                 await io.close("Server shutdown")
 
         # 关闭应用
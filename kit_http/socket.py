@@ -1,27 +1,109 @@
-import json
+import asyncio
+import itertools
 import logging
+import os
 from typing import Optional
 
 import aiohttp
+import orjson
 from aiohttp import web
-from kit_utils import Result, utils
+from kit_utils import Result
 
 import kit_http
+from kit_http.params import get_params
 
 log = logging.getLogger(__name__)
 
+# 进程内单调递增的连接id，带pid前缀避免多worker下重复
+_socket_id_counter = itertools.count(1)
+
 
 class IO:
+    # 按事件名缓存envelope前缀（如 b'{"event":"tick","data":'），
+    # 固定的包装字段只在事件首次发送时编码一次
+    _prefix_cache: dict = {}
+
     def __init__(self, ws: web.WebSocketResponse, _id) -> None:
         self.ws = ws
         self._id = _id
+        # 发送队列，元素为编码好的envelope bytes：emit只负责入队，
+        # 由写入任务合并成批后统一发送，减少高频消息下每帧的send/drain开销
+        self._out_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._writer_task: Optional[asyncio.Task] = None
+
+    def start_writer(self):
+        """启动后台写入任务，需在ws.prepare之后调用"""
+        if self._writer_task is None:
+            self._writer_task = asyncio.get_running_loop().create_task(
+                self._write_loop()
+            )
+
+    async def _write_loop(self):
+        """从队列取出消息，将积压的消息合并为一个JSON数组帧发送"""
+        try:
+            while True:
+                batch = [await self._out_queue.get()]
+                while not self._out_queue.empty():
+                    batch.append(self._out_queue.get_nowait())
+                # 队列中已是编码好的bytes，多条直接拼接成JSON数组，
+                # 无需二次序列化
+                if len(batch) == 1:
+                    payload = batch[0]
+                else:
+                    payload = b"[" + b",".join(batch) + b"]"
+                await self.ws.send_bytes(payload)
+        except asyncio.CancelledError:
+            pass
+        except ConnectionResetError:
+            log.debug("ws connection reset while flushing messages")
+        except Exception as e:
+            log.error(f"ws writer task error: {e}")
 
     async def emit(self, event: str, data: dict):
         if isinstance(data, Result):
             data = data.json
-        await self.ws.send_json({"event": event, "data": data})
+        prefix = IO._prefix_cache.get(event)
+        if prefix is None:
+            # dumps结果以 b'null}' 结尾，去掉后即为可复用的envelope前缀
+            prefix = IO._prefix_cache.setdefault(
+                event, orjson.dumps({"event": event, "data": None})[:-5]
+            )
+        await self.send_frame(prefix + orjson.dumps(data) + b"}")
+
+    async def send_frame(self, payload: bytes):
+        """发送已序列化好的消息帧
+
+        广播场景下同一份消息只编码一次，各连接共享同一bytes。
+        入队即返回，实际发送由写入任务完成，发送方不等待网络写，
+        也不为每条消息额外创建Task。
+        """
+        if self._writer_task is None or self._writer_task.done():
+            # 写入任务未启动或已意外退出时退回直接发送，
+            # 避免消息进入无人消费的队列被静默丢弃
+            if not self.ws.closed:
+                await self.ws.send_bytes(payload)
+            return
+        try:
+            self._out_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            log.warning("ws send queue full, dropping frame")
 
     async def close(self, message: Optional[str] = None):
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+        # 冲刷仍在排队的消息，优雅关闭时不静默丢帧
+        if not self.ws.closed and not self._out_queue.empty():
+            batch = []
+            while not self._out_queue.empty():
+                batch.append(self._out_queue.get_nowait())
+            try:
+                if len(batch) == 1:
+                    await self.ws.send_bytes(batch[0])
+                else:
+                    await self.ws.send_bytes(b"[" + b",".join(batch) + b"]")
+            except (ConnectionResetError, RuntimeError):
+                log.debug("ws connection lost while flushing on close")
         if not self.ws.closed:
             await self.ws.close(
                 code=aiohttp.WSCloseCode.GOING_AWAY,
@@ -31,12 +113,14 @@ class IO:
 
 async def ask(data, io: IO, request):
     if not io.ws.closed:
-        await io.ws.send_json(
-            {
-                "event": request["event"],
-                "data": data,
-                "callback": request["callback"],
-            }
+        await io.send_frame(
+            orjson.dumps(
+                {
+                    "event": request["event"],
+                    "data": data,
+                    "callback": request["callback"],
+                }
+            )
         )
 
 
@@ -63,10 +147,9 @@ async def todo(
         kwargs["callback"] = ask
 
     try:
-        if hasattr(self, f"{event}Event"):
-            handler = getattr(self, f"{event}Event")
+        handler = self._event_handlers.get(event, handler)
 
-        params = utils.getParams(handler, kwargs)
+        params = get_params(handler, kwargs)
         value = await handler(request, io=io, **params)
         if value:
             await io.emit(event, value)
@@ -75,50 +158,69 @@ async def todo(
         await io.emit("error", {"message": str(e)})
 
 
+async def _on_text(self, io: IO, msg, request, handler, kwargs):
+    try:
+        payload = orjson.loads(msg.data)
+        await todo(self, io, payload, request, handler, **kwargs)
+    except orjson.JSONDecodeError:
+        await io.emit("error", {"message": "Invalid JSON format"})
+    except Exception as e:
+        await io.emit(
+            "error",
+            {"message": "An unexpected error occurred", "error": str(e)},
+        )
+
+
+async def _on_binary(self, io: IO, msg, request, handler, kwargs):
+    ...
+
+
+async def _on_closed(self, io: IO, msg, request, handler, kwargs):
+    log.debug("ws connection closed")
+
+
+async def _on_error(self, io: IO, msg, request, handler, kwargs):
+    log.debug(f"ws connection closed with exception {io.ws.exception()}")
+
+
+async def _on_other(self, io: IO, msg, request, handler, kwargs):
+    log.debug("Unexpected message type: %s", msg.type)
+
+
+# 帧类型到处理函数的映射：一次C级字典查找替代逐条消息的if/elif枚举比较
+_WS_HANDLERS = {
+    aiohttp.WSMsgType.TEXT: _on_text,
+    aiohttp.WSMsgType.BINARY: _on_binary,
+    aiohttp.WSMsgType.CLOSED: _on_closed,
+    aiohttp.WSMsgType.ERROR: _on_error,
+}
+
+
 async def init_websocket(
     self: "kit_http.KitHttp", request: web.Request, handler, **kwargs
 ):
 
-    _id = kwargs.pop("id", utils.randomStr(10, is_digits=True))
+    _id = kwargs.pop("id", None) or f"{os.getpid()}-{next(_socket_id_counter)}"
 
-    ws = web.WebSocketResponse()
+    ws = web.WebSocketResponse(**self._ws_settings)
     io = IO(ws, _id)
-    self._socket_clients[_id] = io
 
     # 检查是否可以准备为 WebSocket
     if not ws.can_prepare(request):
         return web.json_response({"error": "Not a WebSocket request"}, status=400)
 
     await ws.prepare(request)
+    # 握手成功后才登记客户端：提前登记的话，上面的early return
+    # 会绕过finally清理，在强引用dict里留下永不清除的残留条目
+    self._socket_clients[_id] = io
+    io.start_writer()
 
     try:
         async for msg in ws:
-            if msg.type == aiohttp.WSMsgType.TEXT:
-                try:
-                    payload = json.loads(msg.data)
-                    await todo(self, io, payload, request, handler, **kwargs)
-                except json.JSONDecodeError:
-                    await io.emit("error", {"message": "Invalid JSON format"})
-                except Exception as e:
-                    await io.emit(
-                        "error",
-                        {"message": "An unexpected error occurred", "error": str(e)},
-                    )
-
-            elif msg.type == aiohttp.WSMsgType.BINARY:
-                ...
-            elif msg.type == aiohttp.WSMsgType.CLOSED:
-                log.debug("ws connection closed")
-
-            elif msg.type == aiohttp.WSMsgType.ERROR:
-                error = f"ws connection closed with exception {ws.exception()}"
-                log.debug(error)
-
-            else:
-                log.debug("Unexpected message type: %s", msg.type)
+            on_msg = _WS_HANDLERS.get(msg.type, _on_other)
+            await on_msg(self, io, msg, request, handler, kwargs)
     finally:
-        if not ws.closed:
-            await ws.close()
-        self._socket_clients.pop(_id, None)
+        await io.close()
+        self._forget_socket(_id, io)
 
     return ws
@@ -1,2 +1,2 @@
 from .main import websocket
-from .socket import Socket
+from .socket import Socket, encode_event
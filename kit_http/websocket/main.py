@@ -1,25 +1,35 @@
-import json
+import asyncio
+import itertools
 import logging
+import os
 
 import aiohttp
+import orjson
 from aiohttp import web
-from kit_utils import utils
+from kit_utils import Result
 
 import kit_http
 
-from .socket import Socket
+from ..params import get_params
+from .socket import Socket, encode_event
 
 log = logging.getLogger(__name__)
 
+# 进程内单调递增的连接id：一次next()即可，无需逐位生成随机数，
+# 配合pid前缀在多worker部署下也不会撞号
+_socket_id_counter = itertools.count(1)
+
 
 async def ask(data, socket: Socket, request):
     if not socket.ws.closed:
-        await socket.ws.send_json(
-            {
-                "event": request["event"],
-                "data": data,
-                "callback": request["callback"],
-            }
+        await socket.send_frame(
+            orjson.dumps(
+                {
+                    "event": request["event"],
+                    "data": data,
+                    "callback": request["callback"],
+                }
+            )
         )
 
 
@@ -39,67 +49,108 @@ async def todo(
     kwargs["event"] = event
     kwargs["data"] = data
 
+    # 本次消息产生的全部出站帧先收集，结束时一次性并发发送，
+    # 避免回调和返回值各自await一轮write/drain
+    outgoing: list = []
+
     # 如果有回调，则将回调逻辑设置在 request 中
     if callback:
         request["event"] = event
         request["callback"] = callback
-        kwargs["callback"] = ask
+
+        async def queue_ask(data, socket, request):
+            outgoing.append(
+                orjson.dumps(
+                    {
+                        "event": request["event"],
+                        "data": data,
+                        "callback": request["callback"],
+                    }
+                )
+            )
+
+        kwargs["callback"] = queue_ask
 
     try:
-        if hasattr(self, f"{event}Event"):
-            handler = getattr(self, f"{event}Event")
+        handler = self._event_handlers.get(event, handler)
 
-        params = utils.getParams(handler, kwargs)
+        params = get_params(handler, kwargs)
         value = await handler(request, socket=socket, **params)
         if value:
-            await socket.emit(event, value)
+            if isinstance(value, Result):
+                value = value.json
+            outgoing.append(encode_event(event, value))
+
+        if len(outgoing) == 1:
+            await socket.send_frame(outgoing[0])
+        elif outgoing:
+            await asyncio.gather(*(socket.send_frame(p) for p in outgoing))
     except Exception as e:
         log.error(f"Unexpected error: {e}")
         await socket.emit("error", {"message": str(e)})
 
 
+async def _handle_text(self, socket: Socket, msg, request, handler, kwargs):
+    try:
+        payload = orjson.loads(msg.data)
+        await todo(self, socket, payload, request, handler, **kwargs)
+    except orjson.JSONDecodeError:
+        await socket.emit("error", {"message": "Invalid JSON format"})
+    except Exception as e:
+        await socket.emit(
+            "error",
+            {"message": "An unexpected error occurred", "error": str(e)},
+        )
+
+
+async def _handle_binary(self, socket: Socket, msg, request, handler, kwargs):
+    ...
+
+
+async def _handle_closed(self, socket: Socket, msg, request, handler, kwargs):
+    log.debug("ws connection closed")
+
+
+async def _handle_error(self, socket: Socket, msg, request, handler, kwargs):
+    log.debug(f"ws connection closed with exception {socket.ws.exception()}")
+
+
+async def _handle_other(self, socket: Socket, msg, request, handler, kwargs):
+    log.debug("Unexpected message type: %s", msg.type)
+
+
+# 按消息类型一次字典查找分发，替代逐条消息走if/elif链
+_HANDLERS = {
+    aiohttp.WSMsgType.TEXT: _handle_text,
+    aiohttp.WSMsgType.BINARY: _handle_binary,
+    aiohttp.WSMsgType.CLOSED: _handle_closed,
+    aiohttp.WSMsgType.ERROR: _handle_error,
+}
+
+
 async def websocket(self: "kit_http.KitHttp", request: web.Request, handler, **kwargs):
 
-    _id = kwargs.pop("id", utils.randomStr(10, is_digits=True))
+    _id = kwargs.pop("id", None) or f"{os.getpid()}-{next(_socket_id_counter)}"
 
-    ws = web.WebSocketResponse()
+    ws = web.WebSocketResponse(**self._ws_settings)
     socket = Socket(ws, _id)
-    self._socket_clients[_id] = socket
 
     # 检查是否可以准备为 WebSocket
     if not ws.can_prepare(request):
         return web.json_response({"error": "Not a WebSocket request"}, status=400)
 
     await ws.prepare(request)
+    # 握手成功后才登记客户端：提前登记的话，上面的early return
+    # 会绕过finally清理，在强引用dict里留下永不清除的残留条目
+    self._socket_clients[_id] = socket
 
     try:
         async for msg in ws:
-            if msg.type == aiohttp.WSMsgType.TEXT:
-                try:
-                    payload = json.loads(msg.data)
-                    await todo(self, socket, payload, request, handler, **kwargs)
-                except json.JSONDecodeError:
-                    await socket.emit("error", {"message": "Invalid JSON format"})
-                except Exception as e:
-                    await socket.emit(
-                        "error",
-                        {"message": "An unexpected error occurred", "error": str(e)},
-                    )
-
-            elif msg.type == aiohttp.WSMsgType.BINARY:
-                ...
-            elif msg.type == aiohttp.WSMsgType.CLOSED:
-                log.debug("ws connection closed")
-
-            elif msg.type == aiohttp.WSMsgType.ERROR:
-                error = f"ws connection closed with exception {ws.exception()}"
-                log.debug(error)
-
-            else:
-                log.debug("Unexpected message type: %s", msg.type)
+            on_msg = _HANDLERS.get(msg.type, _handle_other)
+            await on_msg(self, socket, msg, request, handler, kwargs)
     finally:
         if not ws.closed:
             await ws.close()
-        self._socket_clients.pop(_id, None)
+        self._forget_socket(_id, socket)
 
     return ws
@@ -1,6 +1,18 @@
 from typing import Any, Optional
+
 import aiohttp
+import orjson
 from aiohttp import web
+from kit_utils import Result
+
+
+def encode_event(event: str, data: Any) -> bytes:
+    """将事件编码为envelope bytes
+
+    多个接收方共享同一消息时，调用方应编码一次后
+    对每个连接调用send_frame，避免重复序列化。
+    """
+    return orjson.dumps({"event": event, "data": data})
 
 
 class Socket:
@@ -9,9 +21,19 @@ class Socket:
         self._id = _id
 
     async def emit(self, event: str, data: Any):
-        if "Result" in str(type(data)):
+        # isinstance是C级指针比较，省去每条消息的str(type())构造
+        if isinstance(data, Result):
             data = data.json
-        await self.ws.send_json({"event": event, "data": data})
+        await self.send_frame(encode_event(event, data))
+
+    async def send_frame(self, payload: bytes):
+        """发送已序列化好的消息帧
+
+        广播场景下同一份消息只编码一次，各连接直接发送共享的bytes，
+        省去每个客户端重复的JSON序列化。
+        """
+        if not self.ws.closed:
+            await self.ws.send_bytes(payload)
 
     async def close(self, message: Optional[str] = None):
         if not self.ws.closed:
@@ -7,5 +7,6 @@ setup(
     description="kitHttp",
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
-    install_requires=["aiohttp==3.11.11"],
+    # aiohttp>=3.10带C加速的WebSocketReader重构，帧解析吞吐明显更高
+    install_requires=["aiohttp>=3.10,<4", "orjson"],
 )